@@ -0,0 +1,14 @@
+"""numba entry points with a no-op fallback so the package still imports without numba."""
+from __future__ import annotations
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # kernels run as plain Python; callers with a NumPy path check HAVE_NUMBA
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kw):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
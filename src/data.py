@@ -1,20 +1,62 @@
 from __future__ import annotations
-from collections import deque
 import numpy as np
+from .kernels import rv as _rv, asset_features as _asset_features, all_features as _all_features
 
 class PriceSeries:
+    """Fixed-size ring buffer of prices backed by a preallocated float64 array.
+
+    Every value is written twice, at `head` and `head + maxlen`, so any window of the
+    latest k <= maxlen prices is one contiguous slice and `tail`/`np` never copy.
+    """
     def __init__(self, maxlen: int = 256):
-        self.values = deque(maxlen=maxlen)
+        self.maxlen = maxlen
+        self.buf = np.empty(2 * maxlen, dtype=np.float64)
+        self.n = 0
+        self.head = 0
     def add(self, x: float):
-        self.values.append(float(x))
+        x = float(x)
+        m = self.maxlen
+        self.buf[self.head] = x
+        self.buf[self.head + m] = x
+        self.head = (self.head + 1) % m
+        if self.n < m:
+            self.n += 1
     def ready(self, n: int) -> bool:
-        return len(self.values) >= n
+        return self.n >= n
+    def last(self) -> float:
+        return float(self.buf[self.head + self.maxlen - 1])
     def np(self):
-        return np.array(self.values, dtype=float)
+        """Full history in chronological order, as a view into the buffer."""
+        return self.tail(self.n)
+    def tail(self, k: int):
+        """Last k prices in chronological order, as a contiguous view into the buffer."""
+        end = self.head + self.maxlen
+        return self.buf[end - min(k, self.n):end]
+
+def asset_features(prices: np.ndarray, look_s: int, look_l: int,
+                   vol_look: int) -> tuple[float, float, float, float]:
+    """(mean_short, mean_long, realized_vol, price_sd) over the tail of a non-empty price array"""
+    return _asset_features(np.asarray(prices, dtype=np.float64), look_s, look_l, vol_look)
+
+def batch_features(series: list[PriceSeries], window: int, look_s: int, look_l: int,
+                   vol_look: int) -> np.ndarray:
+    """
+    asset_features for many series at once over their last `window` prices.
+    Returns an (n_series, 4) array of (mean_short, mean_long, realized_vol, price_sd) rows.
+    """
+    k = len(series)
+    P = np.empty((k, window), dtype=np.float64)
+    lens = np.empty(k, dtype=np.int64)
+    for i, ps in enumerate(series):
+        t = ps.tail(window)
+        P[i, window - t.shape[0]:] = t
+        lens[i] = t.shape[0]
+    out = np.empty((k, 4), dtype=np.float64)
+    if k:
+        _all_features(P, lens, look_s, look_l, vol_look, out)
+    return out
 
 def realized_vol(prices: np.ndarray) -> float:
     if len(prices) < 3:
         return 0.0
-    rets = np.diff(np.log(prices + 1e-9))
-    sd = float(np.std(rets)) if rets.size else 0.0
-    return max(sd, 1e-8)
+    return float(_rv(np.asarray(prices, dtype=np.float64)))
@@ -1,4 +1,5 @@
 from __future__ import annotations
+from functools import partial
 from ..recall_client import RecallClient
 from ..logger import setup_logger
 
@@ -8,6 +9,7 @@ class Executor:
     def __init__(self, rc: RecallClient, slippage_tolerance_pct: float):
         self.rc = rc
         self.slippage = slippage_tolerance_pct
+        self._execute = partial(rc.execute, slippage_tolerance_pct=slippage_tolerance_pct)
 
     def trade_usd_notional(self, base_token: str, quote_token: str, usd_amount: float,
                            chain='evm', specific='eth') -> dict:
@@ -15,11 +17,10 @@ class Executor:
         Buy quote_token using base_token (usually USDC -> target token).
         """
         reason = "Strategy Entry"
-        LOG.info(f"BUY: {base_token[:8]}... -> {quote_token[:8]}... | ${usd_amount:.2f} on {chain}/{specific}")
+        LOG.info("BUY: %s... -> %s... | $%.2f on %s/%s", base_token[:8], quote_token[:8], usd_amount, chain, specific)
         
-        return self.rc.execute(
+        return self._execute(
             base_token, quote_token, usd_amount, reason,
-            slippage_tolerance_pct=self.slippage,
             from_chain=chain, from_specific=specific,
             to_chain=chain, to_specific=specific
         )
@@ -30,11 +31,10 @@ class Executor:
         Sell token back to USDC.
         """
         reason = "Strategy Exit"
-        LOG.info(f"SELL: {token[:8]}... -> {to_usdc[:8]}... | ${usd_chunk:.2f} on {chain}/{specific}")
+        LOG.info("SELL: %s... -> %s... | $%.2f on %s/%s", token[:8], to_usdc[:8], usd_chunk, chain, specific)
         
-        return self.rc.execute(
+        return self._execute(
             token, to_usdc, usd_chunk, reason,
-            slippage_tolerance_pct=self.slippage,
             from_chain=chain, from_specific=specific,
             to_chain=chain, to_specific=specific
         )
@@ -46,12 +46,11 @@ class Executor:
         Execute cross-chain swap (if allowed by competition rules).
         """
         reason = "Cross-chain Rebalance"
-        LOG.info(f"CROSS-CHAIN: {token[:8]}... -> {target_token[:8]}... | ${usd_amount:.2f}")
-        LOG.info(f"  From: {from_chain}/{from_specific} -> To: {to_chain}/{to_specific}")
+        LOG.info("CROSS-CHAIN: %s... -> %s... | $%.2f", token[:8], target_token[:8], usd_amount)
+        LOG.info("  From: %s/%s -> To: %s/%s", from_chain, from_specific, to_chain, to_specific)
         
-        return self.rc.execute(
+        return self._execute(
             token, target_token, usd_amount, reason,
-            slippage_tolerance_pct=self.slippage,
             from_chain=from_chain, from_specific=from_specific,
             to_chain=to_chain, to_specific=to_specific
         )
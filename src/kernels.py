@@ -0,0 +1,82 @@
+"""Numba kernels for the per-bar numeric hot path; call warmup() once at startup."""
+from __future__ import annotations
+import math
+import numpy as np
+from ._njit import njit, prange
+
+@njit(cache=True, fastmath=True)
+def rv(p):
+    """Population std of log returns in a single pass (no temporaries)."""
+    n = p.shape[0] - 1
+    s = 0.0
+    s2 = 0.0
+    for i in range(1, p.shape[0]):
+        r = math.log1p((p[i] - p[i - 1]) / max(p[i - 1], 1e-9))
+        s += r
+        s2 += r * r
+    mean = s / n
+    var = max(s2 / n - mean * mean, 0.0)
+    return max(math.sqrt(var), 1e-8)
+
+@njit(cache=True, fastmath=True)
+def asset_features(p, look_s, look_l, vol_look):
+    """
+    One pass over the tail of p returning (mean of last look_s, mean of last look_l,
+    realized vol of last vol_look, population std of the last vol_look prices).
+    Windows longer than p are clamped to len(p), and vol is 0.0 for fewer than 3
+    prices, matching realized_vol.
+    """
+    n = p.shape[0]
+    ks = min(look_s, n)
+    kl = min(look_l, n)
+    kv = min(vol_look, n)
+    v0 = n - kv
+    shift = p[v0]
+    s_sum = 0.0
+    l_sum = 0.0
+    r_sum = 0.0
+    r_sum2 = 0.0
+    d_sum = 0.0
+    d_sum2 = 0.0
+    for i in range(n - max(kl, kv), n):
+        x = p[i]
+        if i >= n - kl:
+            l_sum += x
+        if i >= n - ks:
+            s_sum += x
+        if i >= v0:
+            # shifted by the window's first price to keep sum-of-squares well conditioned
+            d = x - shift
+            d_sum += d
+            d_sum2 += d * d
+        if i > v0:
+            r = math.log1p((x - p[i - 1]) / max(p[i - 1], 1e-9))
+            r_sum += r
+            r_sum2 += r * r
+    vol = 0.0
+    m = kv - 1
+    if m >= 2:
+        mu = r_sum / m
+        vol = max(math.sqrt(max(r_sum2 / m - mu * mu, 0.0)), 1e-8)
+    d_mu = d_sum / kv
+    sd = math.sqrt(max(d_sum2 / kv - d_mu * d_mu, 0.0))
+    return s_sum / ks, l_sum / kl, vol, sd
+
+@njit(cache=True, parallel=True)
+def all_features(P, lens, look_s, look_l, vol_look, out):
+    """Row i of P holds lens[i] right-aligned prices; writes asset_features into out[i]."""
+    w = P.shape[1]
+    for i in prange(P.shape[0]):
+        f = asset_features(P[i, w - lens[i]:], look_s, look_l, vol_look)
+        out[i, 0] = f[0]
+        out[i, 1] = f[1]
+        out[i, 2] = f[2]
+        out[i, 3] = f[3]
+
+def warmup(maxlen: int):
+    """Compile (or load from the on-disk cache) every kernel before the first bar."""
+    p = np.ones(maxlen, dtype=np.float64)
+    rv(p)
+    asset_features(p, 1, 1, maxlen)
+    all_features(p.reshape(1, maxlen), np.full(1, maxlen, dtype=np.int64), 1, 1, maxlen,
+                 np.empty((1, 4), dtype=np.float64))
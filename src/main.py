@@ -1,5 +1,7 @@
 from __future__ import annotations
-import time, numpy as np
+import atexit, heapq, json, logging, signal, threading, time, numpy as np
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from tenacity import retry, stop_after_attempt, wait_exponential
 import requests
@@ -9,68 +11,83 @@ from .utils import load_yaml, env_config
 from .recall_client import RecallClient
 from .rate_limiter import RateLimiter
 from .token_filter import TokenFilter
-from .data import PriceSeries, realized_vol
+from .data import PriceSeries, batch_features
+from .kernels import warmup as warmup_kernels
 from .signals.momentum_vol import MomVolSignal
 from .risk.manager import RiskManager, RiskParams
 from .portfolio.allocator import risk_parity_weights
 from .execution.executor import Executor
-from .metrics import max_drawdown, sharpe_ratio
+from .metrics import EquityStats
 
 LOG = setup_logger()
 
-@retry(stop=stop_after_attempt(5), wait=wait_exponential(min=1, max=12))
+_PX_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="px")
+
+# One discovered token; address is verbatim for API calls, addr_key its lowercase lookup form.
+Tok = namedtuple("Tok", "key symbol address addr_key chain specific volume24h liquidity")
+
+def _parse_px(p: dict) -> float:
+    """Price from a /api/price response: `price`, falling back to `prices.toToken`"""
+    v = p.get("price")
+    if v:
+        return float(v)
+    prices = p.get("prices")
+    if prices:
+        v = prices.get("toToken")
+        if v:
+            return float(v)
+    return 0.0
+
+@retry(stop=stop_after_attempt(4), wait=wait_exponential(min=0.5, max=4))
 def health_check(rc: RecallClient):
-    r = rc.session.get(f"{rc.base_url}/api/health", headers=rc.headers, timeout=20)
-    r.raise_for_status()
-    js = r.json() if r.ok else {}
-    if js.get("status") == "ok" or r.status_code == 200:
+    with rc.session.get(f"{rc.base_url}/api/health", headers=rc.headers,
+                        timeout=(3.05, 5), stream=True) as r:
+        r.raise_for_status()
+        if r.status_code == 200:
+            LOG.info("✓ API health OK")
+            return
+        body = r.raw.read(1024, decode_content=True)
+    try:
+        js = json.loads(body)
+    except ValueError:
+        js = {}
+    if isinstance(js, dict) and js.get("status") == "ok":
         LOG.info("✓ API health OK")
         return
-    raise RuntimeError(f"Health not ok: {r.status_code}, {r.text[:200]}")
+    raise RuntimeError(f"Health not ok: {r.status_code}, {body[:200]!r}")
 
-def get_token_balance(balances: dict, symbol: str, chain: str = None, specific: str = None) -> float:
-    """Get balance for a token, optionally filtering by chain"""
+def index_balances(balances: dict) -> dict[tuple[str, str, str], float]:
+    """Build a {(SYMBOL, chain, specificChain): amount} map from a balances response"""
+    idx = {}
     for b in balances.get("balances", []):
-        tok_sym = (b.get("symbol") or "").upper()
-        if tok_sym != symbol.upper():
-            continue
-        if chain and b.get("chain") != chain:
-            continue
-        if specific and b.get("specificChain") != specific:
-            continue
-        return float(b.get("amount", 0.0))
-    return 0.0
-
-def mark_to_market_usd(rc: RecallClient, balances: dict, tracked_tokens: dict) -> tuple[float, dict]:
+        sym = b.get("symbol")
+        k = (sym.upper() if sym else "", b.get("chain"), b.get("specificChain"))
+        if k not in idx:
+            idx[k] = float(b.get("amount", 0.0))
+    return idx
+
+def mark_to_market_usd(rc: RecallClient, balances: dict, tracked_tokens: dict,
+                       price_cache: dict | None = None) -> tuple[float, dict]:
     """
     Calculate total portfolio value and per-asset exposure.
-    tracked_tokens: {symbol: {address, chain, specific}}
+    tracked_tokens: {(symbol, specific): (addr_key, address, chain, specific)}, built once by
+    tracked_token_index(); used when a balance row has no tokenAddress.
+    price_cache: optional {(addr_key, chain, specific): price} already known this bar.
     Returns: (total_equity_usd, {symbol: exposure_usd})
     """
-    price_cache = {}
+    price_cache = dict(price_cache) if price_cache else {}
     exposures = {}
-    
-    def _get_price(addr: str, ch: str, sp: str) -> float:
-        key = f"{addr}:{ch}:{sp}".lower()
-        if key not in price_cache:
-            try:
-                p = rc.get_price(addr, chain=ch, specific=sp)
-                price_cache[key] = float(p.get("price") or p.get("prices", {}).get("toToken", 0) or 0)
-            except Exception as e:
-                LOG.warning(f"Price fetch failed {addr[:8]}...{ch}/{sp}: {e}")
-                price_cache[key] = 0.0
-        return price_cache[key]
-    
     total_usd = 0.0
+    pending = {}
+    held = []
     
     for b in balances.get("balances", []):
         qty = float(b.get("amount", 0))
         if qty <= 0:
             continue
         
-        sym = (b.get("symbol") or "").upper()
-        addr = (b.get("tokenAddress") or "").lower()
-        ch = b.get("chain", "evm")
+        sym = b.get("symbol")
+        sym = sym.upper() if sym else ""
         sp = b.get("specificChain", "eth")
 
         if sym == "USDC":
@@ -78,47 +95,116 @@ def mark_to_market_usd(rc: RecallClient, balances: dict, tracked_tokens: dict) -
             exposures[f"USDC_{sp}"] = exposures.get(f"USDC_{sp}", 0) + qty
             continue
 
-        if not addr and sym in tracked_tokens:
-            token_info = tracked_tokens[sym]
-            addr = token_info["address"].lower()
-            ch = token_info["chain"]
-            sp = token_info["specific"]
-        
+        addr = b.get("tokenAddress")
         if addr:
-            px = _get_price(addr, ch, sp)
-            usd_val = qty * px
-            total_usd += usd_val
-            exposures[f"{sym}_{sp}"] = exposures.get(f"{sym}_{sp}", 0) + usd_val
+            addr_key = addr.lower()
+            ch = b.get("chain", "evm")
+        else:
+            info = tracked_tokens.get((sym, sp))
+            if info is None:
+                continue
+            addr_key, addr, ch, sp = info
+
+        key = (addr_key, ch, sp)
+        if key not in price_cache:
+            pending[key] = (addr, ch, sp)
+        held.append((sym, sp, qty, key))
+
+    if pending:
+        fetched = rc.get_prices_batch(list(pending.values()))
+        for key, tok in pending.items():
+            r = fetched[tok]
+            if isinstance(r, Exception):
+                LOG.warning("Price fetch failed %s...%s/%s: %s", tok[0][:8], tok[1], tok[2], r)
+                price_cache[key] = 0.0
+            else:
+                price_cache[key] = _parse_px(r)
+
+    for sym, sp, qty, key in held:
+        usd_val = qty * price_cache[key]
+        total_usd += usd_val
+        exposures[f"{sym}_{sp}"] = exposures.get(f"{sym}_{sp}", 0) + usd_val
     
-    LOG.info(f"MTM | Total: ${total_usd:.2f} | Assets: {len([v for v in exposures.values() if v > 1])}")
+    if LOG.isEnabledFor(logging.INFO):
+        LOG.info("MTM | Total: $%.2f | Assets: %d", total_usd, sum(1 for v in exposures.values() if v > 1))
     return total_usd, exposures
 
-def write_telemetry(csv_path: Path, t: float, equity: float, sharpe: float, mdd: float, trades: int):
-    header = ["timestamp", "equity_usd", "sharpe", "max_drawdown", "daily_trades"]
-    newfile = not csv_path.exists()
-    with csv_path.open("a", newline="", encoding="utf-8") as f:
-        import csv as _csv
-        w = _csv.writer(f)
-        if newfile:
-            w.writerow(header)
-        w.writerow([int(t), round(equity, 2), round(sharpe, 3), round(mdd, 4), trades])
-
-def discover_tokens(rc: RecallClient, chains: list[dict], token_filter: TokenFilter) -> dict:
+def tracked_token_index(universe: dict[str, Tok]) -> dict:
+    """{(symbol, specific): (addr_key, address, chain, specific)} lookup for mark_to_market_usd"""
+    return {
+        (tok.symbol, tok.specific): (tok.addr_key, tok.address, tok.chain, tok.specific)
+        for tok in universe.values()
+    }
+
+TELEMETRY_HEADER = "timestamp,equity_usd,sharpe,max_drawdown,daily_trades\n"
+
+def open_telemetry(csv_path: Path):
+    """Open the telemetry CSV once for appending, writing the header for a new file"""
+    f = csv_path.open("a", newline="", buffering=8192, encoding="utf-8")
+    # Append mode positions at EOF, so an empty (new or truncated) file gets the header.
+    if f.tell() == 0:
+        f.write(TELEMETRY_HEADER)
+    atexit.register(f.close)
+    return f
+
+def write_telemetry(f, t: float, equity: float, sharpe: float, mdd: float, trades: int):
+    # All fields are numeric, so no CSV quoting/escaping is needed.
+    f.write("%d,%.2f,%.3f,%.4f,%d\n" % (int(t), equity, sharpe, mdd, trades))
+    f.flush()
+
+def wait_next_bar(next_tick: float, bar_sec: float, stop: threading.Event) -> float:
+    """
+    Wait until next_tick + bar_sec on the monotonic clock and return that tick, so bars
+    start on a fixed grid regardless of how long each iteration took. When already past
+    it, return now without waiting instead of firing a burst of catch-up bars.
+    Returns early once `stop` is set.
+    """
+    next_tick += bar_sec
+    delay = next_tick - time.monotonic()
+    if delay > 0:
+        stop.wait(delay)
+        return next_tick
+    return time.monotonic()
+
+def execute_legs(ex: Executor, risk: RiskManager, legs: list[tuple]):
+    """
+    Execute (key, side, from_token, to_token, usd, chain, specific) trade legs concurrently.
+    side is "SELL" (token -> USDC) or "BUY" (USDC -> token); each fill is recorded with risk.
+    """
+    futs = []
+    for key, side, from_tok, to_tok, usd, ch, sp in legs:
+        fn = ex.sell_all if side == "SELL" else ex.trade_usd_notional
+        futs.append((key, side, usd, _PX_POOL.submit(fn, from_tok, to_tok, usd, chain=ch, specific=sp)))
+    for key, side, usd, fut in futs:
+        try:
+            res = fut.result()
+            LOG.info("  → %s %s $%.2f: %s", side, key, usd, res.get("transactionHash", "OK"))
+            risk.mark_trade()
+        except Exception as e:
+            LOG.error("  %s %s failed: %s", side, key, e)
+
+def discover_tokens(rc: RecallClient, chains: list[dict], token_filter: TokenFilter) -> dict[str, Tok]:
     """
     Discover top liquid tokens across all chains.
-    Returns: {symbol_chain: {address, chain, specific, ...}}
+    Returns: {symbol_chain: Tok}
+    address is kept verbatim for API calls (Solana addresses are case-sensitive);
+    addr_key is its lowercase form, normalized once here for lookups and cache keys.
     """
     discovered = {}
     
+    futs = []
     for chain_cfg in chains:
         ch = chain_cfg["chain"]
         sp = chain_cfg["specific"]
-        LOG.info(f"Discovering tokens on {ch}/{sp}...")
-        
+        LOG.info("Discovering tokens on %s/%s...", ch, sp)
+        futs.append((ch, sp, _PX_POOL.submit(rc.get_tokens, chain=ch, specific=sp, limit=50)))
+
+    # Results are consumed in config order so duplicate keys resolve as before.
+    for ch, sp, fut in futs:
         try:
-            resp = rc.get_tokens(chain=ch, specific=sp, limit=50)
+            resp = fut.result()
             tokens = resp.get("tokens", [])
-            eligible = token_filter.filter_tokens(tokens)
+            eligible = token_filter.filter_tokens_batch(tokens)
             
             for tok in eligible[:10]: 
                 sym = tok.get("symbol", "UNK").upper()
@@ -127,32 +213,31 @@ def discover_tokens(rc: RecallClient, chains: list[dict], token_filter: TokenFil
                     continue
                 
                 key = f"{sym}_{sp}"
-                discovered[key] = {
-                    "symbol": sym,
-                    "address": addr,
-                    "chain": ch,
-                    "specific": sp,
-                    "volume24h": tok.get("volume24h", 0),
-                    "liquidity": tok.get("liquidity", 0),
-                }
+                discovered[key] = Tok(
+                    key, sym, addr, addr.lower(), ch, sp,
+                    tok.get("volume24h", 0), tok.get("liquidity", 0),
+                )
             
-            LOG.info(f"  → {len(eligible)} eligible tokens on {ch}/{sp}")
+            LOG.info("  → %d eligible tokens on %s/%s", len(eligible), ch, sp)
         
         except Exception as e:
-            LOG.error(f"Token discovery failed on {ch}/{sp}: {e}")
+            LOG.error("Token discovery failed on %s/%s: %s", ch, sp, e)
     
-    LOG.info(f"Total discovered: {len(discovered)} tokens")
+    LOG.info("Total discovered: %d tokens", len(discovered))
     return discovered
 
 def run():
     cfg = load_yaml(str(Path(__file__).parent.parent / "config" / "config.yaml"))
     env = env_config(cfg)
-    LOG.info(f"Using base_url={env.base_url}")
+    LOG.info("Using base_url=%s", env.base_url)
 
     rate_limits = cfg.get("rate_limits", {})
     limiter = RateLimiter(rate_limits)
 
-    rc = RecallClient(base_url=env.base_url, api_key=env.api_key, rate_limiter=limiter)
+    # Half a bar, for MTM and other readers. The bar poll passes fresh=True: a cached price
+    # appended to PriceSeries would be a fake zero return (e.g. on the retry after an error).
+    price_ttl = float(cfg.get("strategy", {}).get("bar_seconds", 45)) / 2
+    rc = RecallClient(base_url=env.base_url, api_key=env.api_key, rate_limiter=limiter, price_ttl=price_ttl)
     health_check(rc)
 
     tf_cfg = cfg.get("token_filters", {})
@@ -169,6 +254,12 @@ def run():
     if not universe:
         LOG.error("No eligible tokens found! Exiting.")
         return
+
+    # specific chain -> USDC address; first listed wins, as the old per-trade scan did
+    usdc_by_specific: dict[str, str] = {}
+    for tok in universe.values():
+        if tok.symbol == "USDC":
+            usdc_by_specific.setdefault(tok.specific, tok.address)
    
     strat_cfg = cfg.get("strategy", {})
     look_s = int(strat_cfg.get("lookback_short", 20))
@@ -179,7 +270,7 @@ def run():
     min_mom = float(strat_cfg.get("min_momentum", 0.005))
     bar_sec = int(strat_cfg.get("bar_seconds", 45))
     
-    LOG.info(f"Strategy: short={look_s} long={look_l} vol={vol_look} z_entry={z_entry} bar={bar_sec}s")
+    LOG.info("Strategy: short=%d long=%d vol=%d z_entry=%s bar=%ds", look_s, look_l, vol_look, z_entry, bar_sec)
 
     risk_cfg = cfg.get("risk", {})
     risk = RiskManager(RiskParams(
@@ -202,85 +293,103 @@ def run():
     csv_path = Path(tele_cfg.get("csv_path", "telemetry_equity.csv"))
     log_every = float(tele_cfg.get("log_every_sec", 300))
 
+    tele_f = open_telemetry(csv_path)
+
     ex = Executor(rc, slippage_tolerance_pct=risk.p.slippage_tolerance_pct)
 
+    tracked = tracked_token_index(universe)
+    px_targets = tuple(
+        (tok.key, tok.address, tok.chain, tok.specific, (tok.addr_key, tok.chain, tok.specific))
+        for tok in universe.values()
+    )
+    px_tokens = [(addr, ch, sp) for _, addr, ch, sp, _ in px_targets]
+
+    series_len = max(look_l, vol_look) + 20
     price_series = {}
     for key in universe:
-        price_series[key] = PriceSeries(maxlen=max(look_l, vol_look) + 20)
+        price_series[key] = PriceSeries(maxlen=series_len)
+    # Compile (or load from cache) the numba kernels now rather than on the first bar.
+    warmup_kernels(series_len)
 
     sig = MomVolSignal(look_s, look_l, vol_look, z_entry, z_exit)
 
-    last_rebalance = 0.0
-    last_log = 0.0
-    eq_series = []
+    last_rebalance = float("-inf")
+    last_log = float("-inf")
+    eq_stats = EquityStats(bar_sec)
     
-    LOG.info(f"Starting main loop with {len(universe)} tokens...")
+    LOG.info("Starting main loop with %d tokens...", len(universe))
     
-    while True:
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    next_tick = time.monotonic()
+    while not stop.is_set():
         try:
-            now = time.time()
-
-            for key, tok in universe.items():
-                try:
-                    p_resp = rc.get_price(
-                        tok["address"], 
-                        chain=tok["chain"], 
-                        specific=tok["specific"]
-                    )
-                    px = float(p_resp.get("price") or p_resp.get("prices", {}).get("toToken", 0) or 0)
-                    if px > 0:
-                        price_series[key].add(px)
-                except Exception as e:
-                    LOG.debug(f"Price fetch failed {key}: {e}")
+            now = time.monotonic()
+
+            fetched = rc.get_prices_batch(px_tokens, fresh=True)
+            bar_px = {}
+            for key, addr, ch, sp, px_key in px_targets:
+                r = fetched[(addr, ch, sp)]
+                if isinstance(r, Exception):
+                    LOG.debug("Price fetch failed %s: %s", key, r)
+                    continue
+                px = _parse_px(r)
+                if px > 0:
+                    price_series[key].add(px)
+                    bar_px[px_key] = px
 
             min_ready = min(look_l, vol_look)
+            win = max(look_l, vol_look)
             ready_count = sum(1 for ps in price_series.values() if ps.ready(min_ready))
             if ready_count < 2:
-                LOG.info(f"Warmup: {ready_count}/{len(price_series)} tokens ready")
-                time.sleep(bar_sec)
+                LOG.info("Warmup: %d/%d tokens ready", ready_count, len(price_series))
+                next_tick = wait_next_bar(next_tick, bar_sec, stop)
                 continue
 
+            ready = [(key, ps) for key, ps in price_series.items() if ps.ready(min_ready)]
+            feats = batch_features([ps for _, ps in ready], win, look_s, look_l, vol_look)
+            hist = np.fromiter((ps.n for _, ps in ready), dtype=np.int64, count=len(ready))
+            mean_s, mean_l, vols, price_sd = feats.T
+            weights = sig.weights(hist, mean_s, mean_l, price_sd)
+            moms = mean_s / mean_l - 1.0
+
             signals = {}
-            for key, ps in price_series.items():
-                if not ps.ready(min_ready):
-                    continue
-                
-                arr = ps.np()
-                weight = sig.decide_weight(arr)
-                mom = float(np.mean(arr[-look_s:]) / np.mean(arr[-look_l:]) - 1.0)
-                vol = realized_vol(arr[-vol_look:])
-                
-                if mom > min_mom and weight > 0:
-                    signals[key] = {
-                        "weight": weight,
-                        "momentum": mom,
-                        "volatility": vol,
-                        "price": arr[-1]
-                    }
+            for i in np.flatnonzero((moms > min_mom) & (weights > 0)):
+                key, ps = ready[i]
+                signals[key] = {
+                    "weight": float(weights[i]),
+                    "momentum": float(moms[i]),
+                    "volatility": float(vols[i]),
+                    "price": ps.last()
+                }
             
-            LOG.info(f"Signals: {len(signals)} tokens with positive signal")
+            LOG.info("Signals: %d tokens with positive signal", len(signals))
 
             bals = rc.balances()
-            equity, exposures = mark_to_market_usd(rc, bals, universe)
-            eq_series.append(equity)
+            bal_idx = index_balances(bals)
+            equity, exposures = mark_to_market_usd(rc, bals, tracked, bar_px)
+            eq_stats.add(equity)
 
             if signals:
                 vols_dict = {k: v["volatility"] for k, v in signals.items()}
                 rp_weights = risk_parity_weights(vols_dict, long_only=True)
 
-                for key in signals:
-                    signals[key]["final_weight"] = signals[key]["weight"] * rp_weights[key]
-
-                total_w = sum(s["final_weight"] for s in signals.values())
+                total_w = 0.0
+                for key, s in signals.items():
+                    w = s["weight"] * rp_weights[key]
+                    s["final_weight"] = w
+                    total_w += w
                 if total_w > 0:
-                    for key in signals:
-                        signals[key]["final_weight"] /= total_w
+                    for s in signals.values():
+                        s["final_weight"] /= total_w
 
-            for key, tok in universe.items():
-                sym = tok["symbol"]
-                sp = tok["specific"]
+            exits = []
+            for tok in universe.values():
+                key = tok.key
+                sp = tok.specific
 
-                bal = get_token_balance(bals, sym, chain=tok["chain"], specific=sp)
+                bal = bal_idx.get((tok.symbol, tok.chain, sp), 0.0)
                 if bal <= 0:
                     continue
 
@@ -293,54 +402,40 @@ def run():
                     should_exit = True
                     reason = "no signal"
                 else:
-                    ps = price_series[key]
-                    if ps.ready(min_ready):
-                        arr = ps.np()
-                        mom = float(np.mean(arr[-look_s:]) / np.mean(arr[-look_l:]) - 1.0)
-                        if mom < min_mom:
-                            should_exit = True
-                            reason = f"low momentum {mom:.2%}"
+                    # Momentum from this bar's features; signals only holds ready tokens.
+                    mom = signals[key]["momentum"]
+                    if mom < min_mom:
+                        should_exit = True
+                        reason = f"low momentum {mom:.2%}"
                 
                 if should_exit:
-                    LOG.info(f"EXIT {key}: {reason} | exposure=${exposure:.2f}")
-                    try:
-                        usdc_addr = None
-                        for ub_key, ub_tok in universe.items():
-                            if ub_tok["symbol"] == "USDC" and ub_tok["specific"] == sp:
-                                usdc_addr = ub_tok["address"]
-                                break
-                        
-                        if usdc_addr:
-                            trade_size = min(exposure, risk.p.per_trade_base_usd)
-                            res = ex.sell_all(
-                                tok["address"], usdc_addr, trade_size,
-                                chain=tok["chain"], specific=sp
-                            )
-                            LOG.info(f"  → Sold ${trade_size:.2f}: {res.get('transactionHash', 'OK')}")
-                            risk.mark_trade()
-                        else:
-                            LOG.warning(f"  → No USDC found on {sp}, skip exit")
-                    
-                    except Exception as e:
-                        LOG.error(f"Exit failed for {key}: {e}")
+                    LOG.info("EXIT %s: %s | exposure=$%.2f", key, reason, exposure)
+                    usdc_addr = usdc_by_specific.get(sp)
+                    if usdc_addr:
+                        trade_size = min(exposure, risk.p.per_trade_base_usd)
+                        exits.append((key, "SELL", tok.address, usdc_addr, trade_size, tok.chain, sp))
+                    else:
+                        LOG.warning("  → No USDC found on %s, skip exit", sp)
+
+            execute_legs(ex, risk, exits)
 
             if now - last_rebalance >= rebalance_every:
-                LOG.info(f"=== REBALANCE (trades today: {risk.get_daily_trade_count()}) ===")
+                LOG.info("=== REBALANCE (trades today: %d) ===", risk.get_daily_trade_count())
                 
                 ok, why = risk.check_pretrade(equity)
                 if not ok:
-                    LOG.warning(f"Skip rebalance: {why}")
+                    LOG.warning("Skip rebalance: %s", why)
                 else:
-                    sorted_signals = sorted(
-                        signals.items(), 
-                        key=lambda x: x[1]["final_weight"], 
-                        reverse=True
-                    )[:max_assets]
+                    sorted_signals = heapq.nlargest(
+                        max_assets,
+                        signals.items(),
+                        key=lambda x: x[1]["final_weight"]
+                    )
                     
+                    buys = []
                     for key, sig_data in sorted_signals:
                         tok = universe[key]
-                        sym = tok["symbol"]
-                        sp = tok["specific"]
+                        sp = tok.specific
 
                         target_pct = sig_data["final_weight"] * (1.0 - target_cash_frac)
                         target_usd = equity * target_pct
@@ -354,64 +449,52 @@ def run():
                             
                             ok_size, msg = risk.check_trade_size(trade_size, equity)
                             if not ok_size:
-                                LOG.warning(f"  {key} trade size check: {msg}")
+                                LOG.warning("  %s trade size check: %s", key, msg)
                                 continue
                             
                             ok_exp, msg = risk.check_asset_exposure(current_exp + trade_size, equity)
                             if not ok_exp:
-                                LOG.warning(f"  {key} exposure check: {msg}")
+                                LOG.warning("  %s exposure check: %s", key, msg)
                                 continue
 
-                            usdc_addr = None
-                            for ub_key, ub_tok in universe.items():
-                                if ub_tok["symbol"] == "USDC" and ub_tok["specific"] == sp:
-                                    usdc_addr = ub_tok["address"]
-                                    break
-                            
+                            usdc_addr = usdc_by_specific.get(sp)
                             if not usdc_addr:
-                                LOG.warning(f"  {key} no USDC on {sp}")
+                                LOG.warning("  %s no USDC on %s", key, sp)
                                 continue
                             
-                            try:
-                                LOG.info(f"BUY {key}: ${trade_size:.2f} (target={target_pct:.1%})")
-                                res = ex.trade_usd_notional(
-                                    usdc_addr, tok["address"], trade_size,
-                                    chain=tok["chain"], specific=sp
-                                )
-                                LOG.info(f"  → {res.get('transactionHash', 'OK')}")
-                                risk.mark_trade()
-                            
-                            except Exception as e:
-                                LOG.error(f"  {key} buy failed: {e}")
+                            LOG.info("BUY %s: $%.2f (target=%.1f%%)", key, trade_size, target_pct * 100)
+                            buys.append((key, "BUY", usdc_addr, tok.address, trade_size, tok.chain, sp))
+
+                    execute_legs(ex, risk, buys)
                 
                 last_rebalance = now
 
-            if len(eq_series) >= 3 and (now - last_log) >= log_every:
-                sh = sharpe_ratio(eq_series, bar_seconds=bar_sec)
-                mdd = max_drawdown(eq_series)
+            if eq_stats.ready(3) and (now - last_log) >= log_every:
+                sh = eq_stats.sharpe_ratio()
+                mdd = eq_stats.max_drawdown()
                 trades_today = risk.get_daily_trade_count()
                 
-                LOG.info(f"📊 Equity=${equity:.2f} | Sharpe={sh:.2f} | MDD={mdd:.1%} | Trades={trades_today}")
+                LOG.info("📊 Equity=$%.2f | Sharpe=%.2f | MDD=%.1f%% | Trades=%d", equity, sh, mdd * 100, trades_today)
                 
                 if risk.needs_more_trades():
-                    LOG.warning(f"⚠️  Need {risk.p.min_daily_trades - trades_today} more trades today!")
+                    LOG.warning("⚠️  Need %d more trades today!", risk.p.min_daily_trades - trades_today)
                 
-                write_telemetry(csv_path, now, equity, sh, mdd, trades_today)
+                write_telemetry(tele_f, time.time(), equity, sh, mdd, trades_today)
                 last_log = now
 
-            time.sleep(bar_sec)
+            next_tick = wait_next_bar(next_tick, bar_sec, stop)
         
         except KeyboardInterrupt:
             LOG.info("🛑 Interrupted by user")
             break
         
         except requests.HTTPError as e:
-            LOG.exception(f"HTTP error: {e}")
-            time.sleep(10)
+            LOG.exception("HTTP error: %s", e)
+            stop.wait(10)
         
         except Exception as e:
-            LOG.exception(f"Main loop error: {e}")
-            time.sleep(10)
+            LOG.exception("Main loop error: %s", e)
+            stop.wait(10)
     
     LOG.info("Agent stopped")
 
@@ -1,19 +1,64 @@
 from __future__ import annotations
+import math
 import numpy as np
 
-def max_drawdown(equity: list[float]) -> float:
-    if not equity: return 0.0
-    eq = np.array(equity, dtype=float)
+def max_drawdown(equity: list[float] | np.ndarray) -> float:
+    eq = np.asarray(equity, dtype=float)
+    if not eq.size: return 0.0
     peaks = np.maximum.accumulate(eq)
     dd = (peaks - eq) / np.maximum(peaks, 1e-9)
     return float(np.max(dd)) if dd.size else 0.0
 
-def sharpe_ratio(equity: list[float], bar_seconds: int) -> float:
+def sharpe_ratio(equity: list[float] | np.ndarray, bar_seconds: int) -> float:
     if len(equity) < 3: return 0.0
-    eq = np.array(equity, dtype=float)
-    rets = np.diff(np.log(eq + 1e-9))
+    eq = np.asarray(equity, dtype=float)
+    rets = np.log(eq[1:] / eq[:-1])
     if rets.size < 2: return 0.0
     mu, sd = float(np.mean(rets)), float(np.std(rets))
     if sd == 0.0: return 0.0
     bars_per_year = (365*24*3600) / max(bar_seconds,1)
     return float((mu/sd) * np.sqrt(bars_per_year))
+
+class EquityStats:
+    """
+    Running peak, max drawdown and Welford mean/variance of log returns, updated in
+    O(1) per equity point. Matches max_drawdown/sharpe_ratio over the full history.
+    """
+    def __init__(self, bar_seconds: int):
+        self.bars_per_year = (365*24*3600) / max(bar_seconds, 1)
+        self.n = 0
+        self.peak = float("-inf")
+        self.max_dd = 0.0
+        self.mean_log_ret = 0.0
+        self.M2 = 0.0
+        self.last_log_eq = 0.0
+
+    def add(self, equity: float):
+        equity = float(equity)
+        if equity > self.peak:
+            self.peak = equity
+        dd = (self.peak - equity) / max(self.peak, 1e-9)
+        if dd > self.max_dd:
+            self.max_dd = dd
+        # Equity can hit 0 (empty wallet, every price lookup failed); clamp rather than raise.
+        log_eq = math.log(max(equity, 1e-9))
+        if self.n:
+            r = log_eq - self.last_log_eq
+            k = self.n  # number of returns including this one
+            delta = r - self.mean_log_ret
+            self.mean_log_ret += delta / k
+            self.M2 += delta * (r - self.mean_log_ret)
+        self.last_log_eq = log_eq
+        self.n += 1
+
+    def ready(self, n: int) -> bool:
+        return self.n >= n
+
+    def max_drawdown(self) -> float:
+        return self.max_dd
+
+    def sharpe_ratio(self) -> float:
+        if self.n < 3: return 0.0
+        sd = math.sqrt(self.M2 / (self.n - 1))
+        if sd == 0.0: return 0.0
+        return float((self.mean_log_ret / sd) * math.sqrt(self.bars_per_year))
@@ -1,9 +1,11 @@
 from __future__ import annotations
+import numpy as np
 
 def risk_parity_weights(vols: dict[str, float], long_only: bool = True) -> dict[str, float]:
-    inv = {k: 1.0 / max(float(v), 1e-8) for k, v in vols.items()}
-    s = sum(inv.values()) or 1.0
-    w = {k: (v / s) for k, v in inv.items()}
+    keys = list(vols)
+    v = np.fromiter((vols[k] for k in keys), dtype=np.float64, count=len(keys))
+    inv = 1.0 / np.maximum(v, 1e-8)
     if long_only:
-        w = {k: max(0.0, v) for k, v in w.items()}
-    return w
+        np.clip(inv, 0.0, None, out=inv)
+    inv /= inv.sum() or 1.0
+    return dict(zip(keys, inv.tolist()))
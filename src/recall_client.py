@@ -1,27 +1,68 @@
 from __future__ import annotations
+import asyncio, atexit, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Lock
+import orjson
 import requests
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
 from .logger import setup_logger
 from .rate_limiter import RateLimiter
 
+try:  # optional: async HTTP/2 price fan-out, otherwise get_prices_batch uses threads
+    import httpx
+except ImportError:
+    httpx = None
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
 LOG = setup_logger()
 
+def _transient(e: BaseException) -> bool:
+    """Timeouts, dropped connections, 429 and 5xx are worth retrying; other HTTP errors are not"""
+    if isinstance(e, (requests.Timeout, requests.ConnectionError)):
+        return True
+    if isinstance(e, requests.HTTPError) and e.response is not None:
+        code = e.response.status_code
+        return code == 429 or code >= 500
+    return False
+
+def _atransient(e: BaseException) -> bool:
+    """_transient for the httpx path"""
+    if isinstance(e, httpx.TransportError):
+        return True
+    if isinstance(e, httpx.HTTPStatusError):
+        code = e.response.status_code
+        return code == 429 or code >= 500
+    return False
+
 class RecallClient:
-    def __init__(self, base_url: str, api_key: str, rate_limiter: RateLimiter | None = None):
+    def __init__(self, base_url: str, api_key: str, rate_limiter: RateLimiter | None = None,
+                 price_ttl: float = 0.0):
         self.base_url = base_url.rstrip("/")
         self.session = requests.Session()
         self.limiter = rate_limiter
+        self.price_ttl = price_ttl
+        self._price_cache: dict[tuple[str, str, str], tuple[float, dict]] = {}
+        self._pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="recall")
+        # Private event loop + client for the async price path, created on first use.
+        self._aloop: asyncio.AbstractEventLoop | None = None
+        self._aclient = None
+        self._aloop_lock = Lock()
         
         adapter = requests.adapters.HTTPAdapter(
-            pool_connections=20, 
-            pool_maxsize=20,
+            pool_connections=32, 
+            pool_maxsize=32,
             max_retries=3
         )
         self.session.mount("https://", adapter)
         self.session.mount("http://", adapter)
         self.headers = {
             "Authorization": f"Bearer {api_key}", 
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
+            "Accept-Encoding": "gzip, deflate",
         }
     
     def _rate_limit_wait(self, endpoint: str):
@@ -30,30 +71,142 @@ class RecallClient:
             if not self.limiter.wait_and_acquire(endpoint, max_wait=30):
                 LOG.warning(f"Rate limit wait timeout for {endpoint}")
 
+    def get_price(self, token_address: str, chain="evm", specific="eth", fresh: bool = False) -> dict:
+        """
+        Price response for a token, reused for up to price_ttl seconds when enabled.
+        fresh=True always refetches (and refreshes the cache entry).
+        """
+        k = (token_address, chain, specific)
+        if self.price_ttl > 0 and not fresh:
+            hit = self._price_cache.get(k)
+            if hit and time.monotonic() - hit[0] < self.price_ttl:
+                return hit[1]
+        js = self._fetch_price(token_address, chain, specific)
+        if self.price_ttl > 0:
+            self._price_cache[k] = (time.monotonic(), js)
+        return js
+
+    def get_prices_batch(self, tokens: list[tuple[str, str, str]],
+                         fresh: bool = False) -> dict[tuple[str, str, str], dict | Exception]:
+        """
+        Prices for many (address, chain, specific) tokens at once.
+        The API has no multi-token price endpoint, so single price calls are fanned out:
+        concurrently over one multiplexed httpx client when httpx is installed, otherwise
+        over a thread pool. A failed lookup maps to the exception it raised.
+        fresh is passed through to get_price.
+        """
+        if httpx is not None:
+            with self._aloop_lock:
+                if self._aloop is None:
+                    self._aloop = asyncio.new_event_loop()
+                    atexit.register(self._close_async)
+                return self._aloop.run_until_complete(self.aget_prices(tokens, fresh))
+        futs = {self._pool.submit(self.get_price, *t, fresh): t for t in set(tokens)}
+        out = {}
+        for fut in as_completed(futs):
+            try:
+                out[futs[fut]] = fut.result()
+            except Exception as e:
+                out[futs[fut]] = e
+        return out
+
+    def _close_async(self):
+        """Close the async client and its private loop (registered with atexit)"""
+        with self._aloop_lock:
+            if self._aloop is None or self._aloop.is_closed():
+                return
+            if self._aclient is not None:
+                self._aloop.run_until_complete(self._aclient.aclose())
+                self._aclient = None
+            self._aloop.close()
+
+    async def aget_prices(self, tokens: list[tuple[str, str, str]],
+                          fresh: bool = False) -> dict[tuple[str, str, str], dict | Exception]:
+        """get_prices_batch as a coroutine; requires httpx"""
+        uniq = list(set(tokens))
+        res = await asyncio.gather(*(self.aget_price(*t, fresh) for t in uniq), return_exceptions=True)
+        return dict(zip(uniq, res))
+
+    async def aget_price(self, token_address: str, chain="evm", specific="eth", fresh: bool = False) -> dict:
+        """Async get_price sharing the same TTL cache; requires httpx"""
+        k = (token_address, chain, specific)
+        if self.price_ttl > 0 and not fresh:
+            hit = self._price_cache.get(k)
+            if hit and time.monotonic() - hit[0] < self.price_ttl:
+                return hit[1]
+        js = await self._afetch_price(token_address, chain, specific)
+        if self.price_ttl > 0:
+            self._price_cache[k] = (time.monotonic(), js)
+        return js
+
+    async def _arate_limit_wait(self, endpoint: str):
+        """_rate_limit_wait without blocking the event loop"""
+        if self.limiter:
+            waited = 0.0
+            while True:
+                ok, wait = self.limiter.acquire(endpoint)
+                if ok:
+                    return
+                if waited + wait > 30:
+                    LOG.warning(f"Rate limit wait timeout for {endpoint}")
+                    return
+                await asyncio.sleep(wait)
+                waited += wait
+
     @retry(
         stop=stop_after_attempt(5), 
         wait=wait_exponential(min=1, max=10),
-        retry=retry_if_exception_type((requests.Timeout, requests.ConnectionError))
+        retry=retry_if_exception(_atransient)
     )
-    def get_price(self, token_address: str, chain="evm", specific="eth") -> dict:
-        self._rate_limit_wait("price")
-        r = self.session.get(
+    async def _afetch_price(self, token_address: str, chain="evm", specific="eth") -> dict:
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient(
+                http2=_HTTP2,
+                limits=httpx.Limits(max_connections=32),
+                headers=self.headers,
+                timeout=15,
+            )
+        await self._arate_limit_wait("price")
+        r = await self._aclient.get(
             f"{self.base_url}/api/price",
             params={"token": token_address, "chain": chain, "specificChain": specific},
-            headers=self.headers, 
-            timeout=15,
         )
-        r.raise_for_status()
-        return r.json()
+        try:
+            r.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise httpx.HTTPStatusError(f"{e} | body={r.text[:500]}", request=e.request, response=r) from e
+        return orjson.loads(r.content)
 
     @retry(
-        stop=stop_after_attempt(3), 
-        wait=wait_exponential(min=1, max=8)
+        stop=stop_after_attempt(5), 
+        wait=wait_exponential(min=1, max=10),
+        retry=retry_if_exception(_transient)
     )
+    def _request(self, method: str, path: str, *, endpoint: str, params: dict | None = None,
+                 json: dict | None = None, timeout: float = 15) -> dict:
+        """Rate-limited, retried API call returning the decoded JSON body"""
+        self._rate_limit_wait(endpoint)
+        r = self.session.request(
+            method,
+            f"{self.base_url}{path}",
+            params=params,
+            json=json,
+            headers=self.headers,
+            timeout=timeout,
+        )
+        try:
+            r.raise_for_status()
+        except requests.HTTPError as e:
+            raise requests.HTTPError(f"{e} | body={r.text[:500]}", response=r) from e
+        return orjson.loads(r.content)
+
+    def _fetch_price(self, token_address: str, chain="evm", specific="eth") -> dict:
+        return self._request("GET", "/api/price", endpoint="price", timeout=15,
+                             params={"token": token_address, "chain": chain, "specificChain": specific})
+
     def quote(self, base_token: str, quote_token: str, usd_amount: float,
               from_chain="evm", from_specific="eth", 
               to_chain="evm", to_specific="eth") -> dict:
-        self._rate_limit_wait("trade")
         payload = {
             "baseToken": base_token,
             "quoteToken": quote_token,
@@ -63,24 +216,12 @@ class RecallClient:
             "toChain": to_chain, 
             "toSpecificChain": to_specific,
         }
-        r = self.session.post(
-            f"{self.base_url}/api/trade/quote", 
-            json=payload, 
-            headers=self.headers, 
-            timeout=20
-        )
-        r.raise_for_status()
-        return r.json()
+        return self._request("POST", "/api/trade/quote", endpoint="trade", json=payload, timeout=20)
 
-    @retry(
-        stop=stop_after_attempt(5), 
-        wait=wait_exponential(min=2, max=15)
-    )
     def execute(self, base_token: str, quote_token: str, usd_amount: float, 
                 reason: str, slippage_tolerance_pct: float,
                 from_chain="evm", from_specific="eth", 
                 to_chain="evm", to_specific="eth") -> dict:
-        self._rate_limit_wait("trade")
         payload = {
             "baseToken": base_token,
             "quoteToken": quote_token,
@@ -92,45 +233,16 @@ class RecallClient:
             "toChain": to_chain, 
             "toSpecificChain": to_specific,
         }
-        r = self.session.post(
-            f"{self.base_url}/api/trade/execute", 
-            json=payload, 
-            headers=self.headers, 
-            timeout=40
-        )
         try:
-            r.raise_for_status()
+            return self._request("POST", "/api/trade/execute", endpoint="trade", json=payload, timeout=40)
         except requests.HTTPError as e:
-            LOG.error(f"Trade execution failed: {e} | Response: {r.text[:500]}")
-            raise requests.HTTPError(f"{e} | body={r.text[:500]}") from e
-        return r.json()
+            LOG.error(f"Trade execution failed: {e}")
+            raise
 
-    @retry(
-        stop=stop_after_attempt(4), 
-        wait=wait_exponential(min=1, max=8)
-    )
     def balances(self) -> dict:
-        self._rate_limit_wait("balance")
-        r = self.session.get(
-            f"{self.base_url}/api/agent/balances", 
-            headers=self.headers, 
-            timeout=20
-        )
-        r.raise_for_status()
-        return r.json()
+        return self._request("GET", "/api/agent/balances", endpoint="balance", timeout=20)
     
-    @retry(
-        stop=stop_after_attempt(3), 
-        wait=wait_exponential(min=1, max=6)
-    )
     def get_tokens(self, chain="evm", specific="eth", limit=100) -> dict:
         """Fetch available tokens for a chain"""
-        self._rate_limit_wait("price")
-        r = self.session.get(
-            f"{self.base_url}/api/tokens",
-            params={"chain": chain, "specificChain": specific, "limit": limit},
-            headers=self.headers,
-            timeout=15
-        )
-        r.raise_for_status()
-        return r.json()
+        return self._request("GET", "/api/tokens", endpoint="price", timeout=15,
+                             params={"chain": chain, "specificChain": specific, "limit": limit})
@@ -1,8 +1,11 @@
 from __future__ import annotations
 from dataclasses import dataclass
 import time
+from ..logger import setup_logger
 
-@dataclass
+LOG = setup_logger()
+
+@dataclass(frozen=True, slots=True)
 class RiskParams:
     min_daily_trades: int
     max_daily_trades: int
@@ -16,40 +19,45 @@ class RiskParams:
 class RiskManager:
     def __init__(self, params: RiskParams):
         self.p = params
+        # Limits read on every check, bound once here (RiskParams doesn't change at runtime).
+        self._min_daily = params.min_daily_trades
+        self._max_daily = params.max_daily_trades
+        self._cooldown = params.cooldown_seconds
+        self._max_trade_pct = params.max_single_trade_pct
+        self._max_expo_pct = params.max_exposure_per_asset_pct
+        self._max_dd = params.max_drawdown_stop
         self.daily_count = 0
         self.day_start = int(time.time()) // 86400
-        self.last_trade_ts = 0.0
+        self._next_day_ts = (self.day_start + 1) * 86400
+        # Cooldown runs on the monotonic clock so NTP steps can't shorten or stretch it.
+        self.last_trade_mono = float("-inf")
         self.equity_peak = None
+        self._drawdown_floor = 0.0
         self.stopped = False
-        self.daily_trade_times = [] 
 
-    def _reset_if_new_day(self):
-        day_now = int(time.time()) // 86400
-        if day_now != self.day_start:
-            if self.daily_count < self.p.min_daily_trades and self.daily_count > 0:
-                from ..logger import setup_logger
-                LOG = setup_logger()
-                LOG.warning(f"Previous day had only {self.daily_count} trades, min is {self.p.min_daily_trades}")
+    def _reset_if_new_day(self, now: float):
+        if now >= self._next_day_ts:
+            if self.daily_count < self._min_daily and self.daily_count > 0:
+                LOG.warning("Previous day had only %d trades, min is %d", self.daily_count, self._min_daily)
             
-            self.day_start = day_now
+            self.day_start = int(now) // 86400
+            self._next_day_ts = (self.day_start + 1) * 86400
             self.daily_count = 0
-            self.daily_trade_times = []
 
     def mark_trade(self):
         """Record a trade execution"""
         self.daily_count += 1
-        self.last_trade_ts = time.time()
-        self.daily_trade_times.append(self.last_trade_ts)
+        self.last_trade_mono = time.monotonic()
 
     def get_daily_trade_count(self) -> int:
         """Get current day's trade count"""
-        self._reset_if_new_day()
+        self._reset_if_new_day(time.time())
         return self.daily_count
     
     def needs_more_trades(self) -> bool:
         """Check if we need more trades to meet daily minimum"""
-        self._reset_if_new_day()
-        return self.daily_count < self.p.min_daily_trades
+        self._reset_if_new_day(time.time())
+        return self.daily_count < self._min_daily
 
     def check_trade_size(self, trade_usd: float, total_portfolio_usd: float) -> tuple[bool, str]:
         """Validate trade size against portfolio constraints"""
@@ -57,8 +65,8 @@ class RiskManager:
             return False, "Zero portfolio value"
         
         trade_pct = trade_usd / total_portfolio_usd
-        if trade_pct > self.p.max_single_trade_pct:
-            return False, f"Trade {trade_pct:.1%} > max {self.p.max_single_trade_pct:.1%}"
+        if trade_pct > self._max_trade_pct:
+            return False, f"Trade {trade_pct:.1%} > max {self._max_trade_pct:.1%}"
         
         return True, "OK"
     
@@ -69,8 +77,8 @@ class RiskManager:
             return True, "OK"
         
         exposure_pct = asset_exposure_usd / total_portfolio_usd
-        if exposure_pct > self.p.max_exposure_per_asset_pct:
-            return False, f"Asset exposure {exposure_pct:.1%} > max {self.p.max_exposure_per_asset_pct:.1%}"
+        if exposure_pct > self._max_expo_pct:
+            return False, f"Asset exposure {exposure_pct:.1%} > max {self._max_expo_pct:.1%}"
         
         return True, "OK"
 
@@ -79,21 +87,22 @@ class RiskManager:
         if self.stopped:
             return False, "Drawdown stop active"
         
-        self._reset_if_new_day()
+        now = time.time()
+        self._reset_if_new_day(now)
 
-        if self.equity_peak is None:
+        if self.equity_peak is None or equity_usd >= self.equity_peak:
+            # New high: no drawdown; move the stop level (dd >= stop <=> equity <= floor).
             self.equity_peak = equity_usd
-        else:
-            self.equity_peak = max(self.equity_peak, equity_usd)
-            dd = 0.0 if self.equity_peak <= 0 else (self.equity_peak - equity_usd) / self.equity_peak
-            if dd >= self.p.max_drawdown_stop:
-                self.stopped = True
-                return False, f"Drawdown {dd:.1%} >= stop {self.p.max_drawdown_stop:.1%}"
+            self._drawdown_floor = equity_usd * (1.0 - self._max_dd)
+        elif self.equity_peak > 0 and equity_usd <= self._drawdown_floor:
+            dd = (self.equity_peak - equity_usd) / self.equity_peak
+            self.stopped = True
+            return False, f"Drawdown {dd:.1%} >= stop {self._max_dd:.1%}"
 
-        if self.daily_count >= self.p.max_daily_trades:
-            return False, f"Daily cap {self.p.max_daily_trades} reached"
+        if self.daily_count >= self._max_daily:
+            return False, f"Daily cap {self._max_daily} reached"
 
-        if time.time() - self.last_trade_ts < self.p.cooldown_seconds:
-            return False, f"Cooldown {self.p.cooldown_seconds}s"
+        if self._cooldown and time.monotonic() - self.last_trade_mono < self._cooldown:
+            return False, f"Cooldown {self._cooldown}s"
 
         return True, "OK"
@@ -1,25 +1,101 @@
 from __future__ import annotations
+import math
 import numpy as np
+from .._njit import njit, HAVE_NUMBA
+
+@njit(cache=True, fastmath=True)
+def _momvol_kernel(arr, s, l, v, z_entry, z_exit, inv_entry, entry_off, inv_span):
+    """MomVolSignal.decide_weight in one pass over the last max(l, v) prices."""
+    n = arr.shape[0]
+    w = max(l, v)
+    if n < w:
+        return 0.0
+    shift = np.float64(arr[n - v])
+    s_sum = 0.0
+    l_sum = 0.0
+    d_sum = 0.0
+    d_sum2 = 0.0
+    for i in range(n - w, n):
+        x = arr[i]
+        if i >= n - l:
+            l_sum += x
+        if i >= n - s:
+            s_sum += x
+        if i >= n - v:
+            d = x - shift
+            d_sum += d
+            d_sum2 += d * d
+    d_mu = d_sum / v
+    vol = math.sqrt(max(d_sum2 / v - d_mu * d_mu, 0.0))
+    if vol == 0.0:
+        return 0.0
+    z = (s_sum / s - l_sum / l) / vol
+    if z <= z_exit:
+        return 0.0
+    if z >= z_entry:
+        return min(1.0, z * inv_entry + entry_off)
+    return max(0.0, (z - z_exit) * inv_span)
+
+def _as_prices(arr) -> np.ndarray:
+    """arr as a float32 or float64 array, copying only when it is neither"""
+    a = np.asarray(arr)
+    if a.dtype == np.float32 or a.dtype == np.float64:
+        return a
+    return a.astype(np.float64)
 
 class MomVolSignal:
+    """
+    Momentum z-score signal. Price arrays may be float32 or float64 (C-contiguous is
+    fastest); float32 is read as-is but every reduction accumulates in float64.
+    The vol-window std uses the one-pass E[d^2] - E[d]^2 form over d = x - x[first];
+    the shift, not the max(..., 0) clamp, is what keeps it from cancelling on
+    high-priced, low-vol series.
+    """
     def __init__(self, look_s: int, look_l: int, vol_look: int, z_entry: float, z_exit: float):
         self.s = look_s; self.l = look_l; self.v = vol_look
         self.z_entry = z_entry; self.z_exit = z_exit
+        # Piecewise weight constants: above entry w = z*inv + off, between exit and entry
+        # w = (z - z_exit)*span; same as the guarded divisions they replace.
+        self._inv_z_entry = 1.0 / max(z_entry, 1e-6)
+        self._z_entry_offset = 0.5 - z_entry * self._inv_z_entry
+        self._inv_z_span = 0.3 / max(z_entry - z_exit, 1e-6)
 
     def _z(self, arr: np.ndarray) -> float:
-        if len(arr) < max(self.l, self.v):
+        n = max(self.l, self.v)
+        if len(arr) < n:
             return 0.0
-        m_s = float(np.mean(arr[-self.s:])); m_l = float(np.mean(arr[-self.l:]))
-        spread = m_s - m_l
-        vol = float(np.std(arr[-self.v:]))
+        tail = _as_prices(arr)[-n:]
+        m_s = float(tail[-self.s:].sum(dtype=np.float64)) * (1.0 / self.s)
+        m_l = float(tail[-self.l:].sum(dtype=np.float64)) * (1.0 / self.l)
+        # Shifted by the window's first price, as in _momvol_kernel, so the sum of squares
+        # doesn't cancel on high-priced, low-vol series.
+        tv = tail[-self.v:] - np.float64(tail[-self.v])
+        m_v = float(tv.sum()) * (1.0 / self.v)
+        sq = float(np.dot(tv, tv))
+        vol = math.sqrt(max(sq / self.v - m_v * m_v, 0.0))
         if vol == 0.0:
             return 0.0
-        return spread / vol
+        return (m_s - m_l) / vol
 
     def decide_weight(self, arr: np.ndarray) -> float:
+        if HAVE_NUMBA:
+            return float(_momvol_kernel(_as_prices(arr), self.s, self.l, self.v,
+                                        self.z_entry, self.z_exit, self._inv_z_entry,
+                                        self._z_entry_offset, self._inv_z_span))
         z = self._z(arr)
         if z <= self.z_exit:
             return 0.0
         if z >= self.z_entry:
-            return float(min(1.0, (z - self.z_entry) / max(self.z_entry, 1e-6) + 0.5))
-        return float(max(0.0, (z - self.z_exit) / max(self.z_entry - self.z_exit, 1e-6) * 0.3))
+            return float(min(1.0, z * self._inv_z_entry + self._z_entry_offset))
+        return float(max(0.0, (z - self.z_exit) * self._inv_z_span))
+
+    def weights(self, n: np.ndarray, m_s: np.ndarray, m_l: np.ndarray, sd: np.ndarray) -> np.ndarray:
+        """
+        decide_weight for many assets at once from precomputed window stats:
+        history length n, short/long means and the price std over the vol window.
+        """
+        full = (n >= max(self.l, self.v)) & (sd > 0.0)
+        z = np.divide(m_s - m_l, sd, out=np.zeros_like(sd), where=full)
+        hi = np.minimum(1.0, z * self._inv_z_entry + self._z_entry_offset)
+        mid = np.maximum(0.0, (z - self.z_exit) * self._inv_z_span)
+        return np.where(z <= self.z_exit, 0.0, np.where(z >= self.z_entry, hi, mid))
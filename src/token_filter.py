@@ -1,52 +1,116 @@
 from __future__ import annotations
+import logging
+from operator import itemgetter
+import numpy as np
+from ._njit import njit, prange, HAVE_NUMBA
 from .logger import setup_logger
 
 LOG = setup_logger()
 
+# is_eligible reason codes; REJECT_* index _REASONS and _FIELDS
+OK, REJECT_AGE, REJECT_VOL, REJECT_LIQ, REJECT_FDV = range(5)
+_REASONS = ("OK", "Age %.0fh < %.0fh", "Vol24h $%.0f < $%.0f",
+            "Liquidity $%.0f < $%.0f", "FDV $%.0f < $%.0f")
+_FIELDS = (None, 'ageHours', 'volume24h', 'liquidity', 'fdv')
+_TOK_GET = itemgetter('volume24h', 'ageHours', 'liquidity', 'fdv')
+
+def _asfloat(v, d: float = 0.0) -> float:
+    """float(v), skipping the call for JSON floats; None (JSON null) maps to d"""
+    return v if type(v) is float else float(v) if v is not None else d
+
+@njit(cache=True, parallel=True)
+def _filter_mask(ages, vols, liqs, fdvs, min_age, min_vol, min_liq, min_fdv, out):
+    """out[i] = token i passes every minimum (NaN passes, as in is_eligible)."""
+    for i in prange(out.shape[0]):
+        out[i] = not (vols[i] < min_vol or ages[i] < min_age
+                      or liqs[i] < min_liq or fdvs[i] < min_fdv)
+
 class TokenFilter:
     """Filters tokens based on competition eligibility criteria"""
-    
-    def __init__(self, min_age_hours: float, min_24h_vol: float, 
+
+    def __init__(self, min_age_hours: float, min_24h_vol: float,
                  min_liquidity: float, min_fdv: float):
         self.min_age_h = min_age_hours
         self.min_vol = min_24h_vol
         self.min_liq = min_liquidity
         self.min_fdv = min_fdv
-    
-    def is_eligible(self, token_data: dict) -> tuple[bool, str]:
+
+    def is_eligible(self, token_data: dict) -> tuple[bool, int]:
         """
         Check if token meets all eligibility requirements.
-        Returns (eligible, reason)
+        Returns (eligible, reason code); see reason_str for the message.
         """
-        age_h = float(token_data.get('ageHours', 0))
-        if age_h < self.min_age_h:
-            return False, f"Age {age_h:.0f}h < {self.min_age_h:.0f}h"
-
-        vol_24h = float(token_data.get('volume24h', 0))
-        if vol_24h < self.min_vol:
-            return False, f"Vol24h ${vol_24h:.0f} < ${self.min_vol:.0f}"
-
-        liquidity = float(token_data.get('liquidity', 0))
-        if liquidity < self.min_liq:
-            return False, f"Liquidity ${liquidity:.0f} < ${self.min_liq:.0f}"
-
-        fdv = float(token_data.get('fdv', 0))
-        if fdv < self.min_fdv:
-            return False, f"FDV ${fdv:.0f} < ${self.min_fdv:.0f}"
-        
-        return True, "OK"
-    
+        try:
+            vol_24h, age_h, liquidity, fdv = _TOK_GET(token_data)
+        except KeyError:
+            get = token_data.get
+            vol_24h, age_h = get('volume24h', 0.0), get('ageHours', 0.0)
+            liquidity, fdv = get('liquidity', 0.0), get('fdv', 0.0)
+        # Volume first: it rejects the most tokens (fresh, thin listings).
+        if _asfloat(vol_24h) < self.min_vol:
+            return False, REJECT_VOL
+        if _asfloat(age_h) < self.min_age_h:
+            return False, REJECT_AGE
+        if _asfloat(liquidity) < self.min_liq:
+            return False, REJECT_LIQ
+        if _asfloat(fdv) < self.min_fdv:
+            return False, REJECT_FDV
+        return True, OK
+
+    def reason_str(self, code: int, token_data: dict) -> str:
+        """Human-readable message for an is_eligible reason code"""
+        if code == OK:
+            return _REASONS[OK]
+        mins = (None, self.min_age_h, self.min_vol, self.min_liq, self.min_fdv)
+        return _REASONS[code] % (_asfloat(token_data.get(_FIELDS[code], 0.0)), mins[code])
+
     def filter_tokens(self, tokens: list[dict]) -> list[dict]:
         """Return only eligible tokens from a list"""
+        debug = LOG.isEnabledFor(logging.DEBUG)
+        is_eligible = self.is_eligible
         eligible = []
         for tok in tokens:
-            ok, reason = self.is_eligible(tok)
-            symbol = tok.get('symbol', 'UNK')
+            ok, code = is_eligible(tok)
             if ok:
-                LOG.debug(f"✓ {symbol} eligible")
                 eligible.append(tok)
-            else:
-                LOG.debug(f"✗ {symbol} rejected: {reason}")
-        
-        LOG.info(f"Token filter: {len(eligible)}/{len(tokens)} eligible")
+                if debug:
+                    LOG.debug("✓ %s eligible", tok.get('symbol', 'UNK'))
+            elif debug:
+                LOG.debug("✗ %s rejected: %s", tok.get('symbol', 'UNK'), self.reason_str(code, tok))
+
+        LOG.info("Token filter: %d/%d eligible", len(eligible), len(tokens))
+        return eligible
+
+    def filter_tokens_batch(self, tokens: list[dict]) -> list[dict]:
+        """filter_tokens over a whole batch at once, with one NumPy mask per criterion"""
+        n = len(tokens)
+        age, vol, liq, fdv = (
+            np.fromiter((_asfloat(t.get(f, 0.0)) for t in tokens), dtype=np.float64, count=n)
+            for f in _FIELDS[1:]
+        )
+        debug = LOG.isEnabledFor(logging.DEBUG)
+        # Reject on "< minimum" rather than keep on ">=", so NaN passes exactly as in is_eligible.
+        rej = None
+        if HAVE_NUMBA and not debug:
+            ok = np.empty(n, dtype=np.bool_)
+            _filter_mask(age, vol, liq, fdv, self.min_age_h, self.min_vol, self.min_liq, self.min_fdv, ok)
+        else:
+            rej = (vol < self.min_vol, age < self.min_age_h, liq < self.min_liq, fdv < self.min_fdv)
+            ok = rej[0] | rej[1]
+            np.logical_or(ok, rej[2], out=ok)
+            np.logical_or(ok, rej[3], out=ok)
+            np.logical_not(ok, out=ok)
+        eligible = [tokens[i] for i in np.flatnonzero(ok)]
+
+        if debug:
+            if rej is None:  # kernel path: the per-criterion masks were never built
+                rej = (vol < self.min_vol, age < self.min_age_h, liq < self.min_liq, fdv < self.min_fdv)
+            codes = np.select(rej, (REJECT_VOL, REJECT_AGE, REJECT_LIQ, REJECT_FDV), OK)
+            for tok, code in zip(tokens, codes.tolist()):
+                if code == OK:
+                    LOG.debug("✓ %s eligible", tok.get('symbol', 'UNK'))
+                else:
+                    LOG.debug("✗ %s rejected: %s", tok.get('symbol', 'UNK'), self.reason_str(code, tok))
+
+        LOG.info("Token filter: %d/%d eligible", len(eligible), n)
         return eligible
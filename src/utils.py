@@ -1,23 +1,42 @@
 from __future__ import annotations
 import os, yaml
 from dataclasses import dataclass
+from functools import lru_cache
 from dotenv import load_dotenv
 from pathlib import Path
 
+try:  # libyaml-backed loader when PyYAML was built with it
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 load_dotenv(dotenv_path=Path(__file__).parents[1] / ".env", override=True)
 
-def load_yaml(path: str):
+@lru_cache(maxsize=16)
+def _load_yaml_cached(path: str, mtime: float):
     with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_Loader)
 
-@dataclass
+def load_yaml(path: str):
+    """Parsed YAML, reparsed only when the file's mtime changes; treat the result as read-only."""
+    return _load_yaml_cached(os.path.abspath(path), os.path.getmtime(path))
+
+@dataclass(frozen=True, slots=True)
 class EnvCfg:
     base_url: str
     api_key: str
 
 def env_config(cfg) -> EnvCfg:
+    urls = cfg["env"]
+    return _env_config(urls.get("production_url"), urls.get("sandbox_url"))
+
+@lru_cache(maxsize=4)
+def _env_config(production_url: str | None, sandbox_url: str | None) -> EnvCfg:
+    """Reads the environment once per process; a missing API key raises and is not cached."""
     env = (os.getenv("RECALL_ENV", "production").strip().lower())
-    base_url = cfg["env"]["production_url"] if env == "production" else cfg["env"]["sandbox_url"]
+    base_url = production_url if env == "production" else sandbox_url
+    if base_url is None:
+        raise KeyError("production_url" if env == "production" else "sandbox_url")
     api_key = os.getenv("RECALL_API_KEY", "").strip()
     if not api_key:
         raise RuntimeError("RECALL_API_KEY is missing. Put it in .env")